@@ -8,29 +8,109 @@ It handles stack dependencies and provides deployment status monitoring.
 """
 
 import boto3
+import hashlib
 import json
+import logging
+import random
+import re
+import shutil
+import subprocess
+import threading
 import time
 import argparse
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError, WaiterError
+
+
+logger = logging.getLogger(__name__)
+
+# Timestamped lines show how long each stack operation took
+LOG_FORMAT = '%(asctime)s %(levelname)s %(message)s'
+
+# Parallel stack deploys poll CloudFormation hard enough to get throttled; at most
+# MAX_PARALLEL_STACKS calls share a client, within the default pool of 10
+BOTO_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    connect_timeout=5,
+    read_timeout=65
+)
+
+# Stream template uploads, switching to parallel multipart above 8 MB
+TEMPLATE_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Top-level Transform key in a YAML template; JSON templates are parsed instead
+TRANSFORM_PATTERN = re.compile(rb'^Transform\s*:')
+
+# Largest template CloudFormation accepts inline via TemplateBody
+MAX_TEMPLATE_BODY_BYTES = 51200
+
+# Poll every 6s for up to 60 minutes while waiting on stack operations
+STACK_WAITER_CONFIG = {'Delay': 6, 'MaxAttempts': 600}
+
+# Change sets are usually computed within seconds; give up after 10 minutes
+CHANGE_SET_WAITER_CONFIG = {'Delay': 3, 'MaxAttempts': 200}
+
+# Keep tailed stack events around for an hour
+EVENT_RETENTION_SECONDS = 3600
+
+# Dependent stack parameters and the foundation stack outputs that populate them
+PARAMETER_TO_OUTPUT = {
+    'DataLakeBucket': 'DataLakeBucketName',
+    'GlueDatabase': 'GlueDatabaseName',
+    'GlueServiceRoleArn': 'GlueServiceRoleArn',
+    'AthenaWorkgroup': 'AthenaWorkgroupName',
+    'AthenaResultsBucket': 'AthenaResultsBucketName'
+}
+
+# Deployment buckets confirmed to exist are remembered locally for a week
+BUCKET_CACHE_DIR = Path.home() / '.cache' / 'f1-gitops' / 'buckets'
+BUCKET_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Upper bound on stacks deployed concurrently within one dependency level
+MAX_PARALLEL_STACKS = 4
 
 
 class CloudFormationDeployer:
     """Handles CloudFormation stack deployments with dependency management."""
     
-    def __init__(self, region: str = 'us-east-1', profile: Optional[str] = None):
+    def __init__(self, region: str = 'us-east-1', profile: Optional[str] = None,
+                 environment: Optional[str] = None):
         """Initialize the deployer with AWS configuration."""
         self.region = region
+        self.environment = environment
         self.session = boto3.Session(profile_name=profile) if profile else boto3.Session()
-        self.cf_client = self.session.client('cloudformation', region_name=region)
-        self.s3_client = self.session.client('s3', region_name=region)
+        self.cf_client = self.session.client('cloudformation', region_name=region, config=BOTO_CONFIG)
+        self.s3_client = self.session.client('s3', region_name=region, config=BOTO_CONFIG)
+        self.sns_client = self.session.client('sns', region_name=region, config=BOTO_CONFIG)
+        self.sqs_client = self.session.client('sqs', region_name=region, config=BOTO_CONFIG)
+        
+        # Stack event notifications are set up on first use and shared by all stacks
+        self._event_channel_lock = threading.Lock()
+        self._event_channel_ready = False
+        self._event_topic_arn = None
+        self._event_queue_url = None
         
     def create_deployment_bucket(self, bucket_name: str) -> str:
         """Create S3 bucket for CloudFormation templates if it doesn't exist."""
+        # Skip the S3 round-trip if this bucket was confirmed recently
+        sentinel = BUCKET_CACHE_DIR / bucket_name
+        if sentinel.exists() and time.time() - sentinel.stat().st_mtime < BUCKET_CACHE_TTL_SECONDS:
+            logger.info(f"✓ Deployment bucket '{bucket_name}' already exists (cached)")
+            return bucket_name
+        
         try:
             # Check if bucket exists
             self.s3_client.head_bucket(Bucket=bucket_name)
-            print(f"✓ Deployment bucket '{bucket_name}' already exists")
+            logger.info(f"✓ Deployment bucket '{bucket_name}' already exists")
             
             # Enable versioning if not already enabled
             try:
@@ -40,11 +120,15 @@ class CloudFormationDeployer:
                         Bucket=bucket_name,
                         VersioningConfiguration={'Status': 'Enabled'}
                     )
-                    print(f"✓ Enabled versioning on bucket '{bucket_name}'")
+                    logger.info(f"✓ Enabled versioning on bucket '{bucket_name}'")
             except Exception as e:
-                print(f"⚠️  Could not enable versioning: {str(e)}")
+                logger.warning(f"⚠️  Could not enable versioning: {str(e)}")
                 
-        except:
+        except ClientError as e:
+            # Only a missing bucket should be created; surface permission and other errors
+            if e.response['Error']['Code'] not in ('404', 'NoSuchBucket'):
+                raise
+            
             # Create bucket
             if self.region == 'us-east-1':
                 self.s3_client.create_bucket(Bucket=bucket_name)
@@ -59,31 +143,107 @@ class CloudFormationDeployer:
                 Bucket=bucket_name,
                 VersioningConfiguration={'Status': 'Enabled'}
             )
-            print(f"✓ Created deployment bucket with versioning: {bucket_name}")
+            logger.info(f"✓ Created deployment bucket with versioning: {bucket_name}")
+        
+        try:
+            sentinel.parent.mkdir(parents=True, exist_ok=True)
+            sentinel.touch()
+        except OSError as e:
+            logger.warning(f"⚠️  Could not cache deployment bucket state: {str(e)}")
             
         return bucket_name
     
-    def upload_template(self, template_path: Path, bucket_name: str, key_prefix: str = "") -> str:
-        """Upload CloudFormation template to S3."""
-        key = f"{key_prefix}{template_path.name}" if key_prefix else template_path.name
+    def validate_template(self, template_path: Path) -> bool:
+        """Validate a template with cfn-lint (if installed) and CloudFormation before deploying."""
+        if shutil.which('cfn-lint'):
+            # cfn-lint exit codes are a bitmask; 2 means errors, 4/8 are warnings/info
+            result = subprocess.run(['cfn-lint', str(template_path)])
+            if result.returncode & 2:
+                logger.error(f"❌ cfn-lint found errors in template: {template_path.name}")
+                return False
         
-        with open(template_path, 'r') as f:
-            template_content = f.read()
-            
-        self.s3_client.put_object(
-            Bucket=bucket_name,
-            Key=key,
-            Body=template_content,
-            ContentType='text/yaml'
-        )
+        template_body = template_path.read_text(encoding='utf-8')
+        if len(template_body.encode('utf-8')) > MAX_TEMPLATE_BODY_BYTES:
+            # Too large to send inline; CloudFormation validates it from S3 on deploy
+            return True
         
+        try:
+            self.cf_client.validate_template(TemplateBody=template_body)
+        except ClientError as e:
+            # Permission or throttling errors say nothing about the template; CloudFormation
+            # still validates it on deploy
+            if e.response['Error']['Code'] != 'ValidationError':
+                logger.warning(f"⚠️  Could not validate template {template_path.name}: {str(e)}")
+                return True
+            logger.error(f"❌ Template validation failed for {template_path.name}: {str(e)}")
+            return False
+
+        logger.info(f"✓ Validated template: {template_path.name}")
+        return True
+    
+    def upload_template(self, template_path: Path, bucket_name: str,
+                        key_prefix: str = "") -> Optional[Tuple[str, bool]]:
+        """Upload CloudFormation template to S3 if changed; returns its URL and whether it has a Transform."""
+        key = f"{key_prefix}{template_path.name}" if key_prefix else template_path.name
         template_url = f"https://{bucket_name}.s3.{self.region}.amazonaws.com/{key}"
-        print(f"✓ Uploaded template: {template_path.name}")
-        return template_url
+        
+        # Hash line by line so the template is not held in memory for the upload
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        needs_auto_expand = False
+        with open(template_path, 'rb') as f:
+            for line in f:
+                md5.update(line)
+                sha256.update(line)
+                if TRANSFORM_PATTERN.match(line):
+                    needs_auto_expand = True
+        
+        if template_path.suffix == '.json':
+            # JSON nesting is not visible line by line, so parse it for a top-level key
+            try:
+                with open(template_path, 'rb') as f:
+                    needs_auto_expand = 'Transform' in json.load(f)
+            except ValueError as e:
+                logger.error(f"❌ Invalid JSON in template {template_path.name}: {str(e)}")
+                return None
+        
+        # Single-part uploads have the content MD5 as their ETag
+        try:
+            existing = self.s3_client.head_object(Bucket=bucket_name, Key=key)
+        except ClientError as e:
+            # Without s3:ListBucket a missing key is reported as 403 rather than 404
+            if e.response['Error']['Code'] not in ('403', '404', 'NoSuchKey'):
+                raise
+            existing = None
+        
+        if existing and existing['ETag'].strip('"') == md5.hexdigest():
+            logger.info(f"✓ Template unchanged, skipping upload: {template_path.name}")
+            return template_url, needs_auto_expand
+        
+        upload_kwargs = {
+            'ExtraArgs': {
+                'ContentType': 'text/yaml',
+                'Metadata': {'sha256': sha256.hexdigest()}
+            },
+            'Config': TEMPLATE_TRANSFER_CONFIG
+        }
+        try:
+            self.s3_client.upload_file(str(template_path), bucket_name, key, **upload_kwargs)
+        except S3UploadFailedError as e:
+            if 'NoSuchBucket' not in str(e):
+                raise
+            # The bucket was deleted while its cache sentinel was still fresh
+            logger.warning(f"⚠️  Deployment bucket '{bucket_name}' is gone - recreating it")
+            (BUCKET_CACHE_DIR / bucket_name).unlink(missing_ok=True)
+            self.create_deployment_bucket(bucket_name)
+            self.s3_client.upload_file(str(template_path), bucket_name, key, **upload_kwargs)
+        
+        logger.info(f"✓ Uploaded template: {template_path.name}")
+        return template_url, needs_auto_expand
     
     def deploy_stack(self, stack_name: str, template_url: str, parameters: Dict[str, str], 
-                    capabilities: List[str] = None) -> bool:
-        """Deploy or update a CloudFormation stack."""
+                    capabilities: List[str] = None) -> Optional[Dict]:
+        """Deploy or update a CloudFormation stack, returning its final description on success."""
         
         # Convert parameters to CloudFormation format
         cf_parameters = [
@@ -91,173 +251,397 @@ class CloudFormationDeployer:
             for key, value in parameters.items()
         ]
         
-        # Check if stack exists
-        stack_exists = self._stack_exists(stack_name)
-        
         try:
+            # Check if stack exists
+            stack_exists = self._stack_exists(stack_name)
+            
             if stack_exists:
+                existing_stack = self._describe_stack(stack_name)
+                
+                if existing_stack['StackStatus'] == 'REVIEW_IN_PROGRESS':
+                    # Stacks left by an unexecuted CREATE change set reject create_stack
+                    logger.info(f"🚀 Creating stack through change set: {stack_name}")
+                    if not self._execute_change_set(stack_name, template_url, cf_parameters,
+                                                    capabilities or [], 'CREATE', existing_stack):
+                        # The stack stays in REVIEW_IN_PROGRESS, which the create waiter never leaves
+                        logger.error(f"❌ Change set for {stack_name} contained no changes to create")
+                        return None
+                    waiter_name = 'stack_create_complete'
                 # Check if we need to recreate the stack due to parameter changes
-                if self._needs_recreation(stack_name, parameters):
-                    print(f"🔄 Stack parameters changed - deleting and recreating: {stack_name}")
+                elif self._needs_recreation(existing_stack, parameters):
+                    logger.info(f"🔄 Stack parameters changed - deleting and recreating: {stack_name}")
                     self._delete_stack(stack_name)
                     stack_exists = False
                 else:
-                    print(f"📝 Updating stack: {stack_name}")
-                    try:
-                        self.cf_client.update_stack(
-                            StackName=stack_name,
-                            TemplateURL=template_url,
-                            Parameters=cf_parameters,
-                            Capabilities=capabilities or []
-                        )
-                    except Exception as e:
-                        if "No updates are to be performed" in str(e):
-                            print(f"ℹ️  Stack {stack_name} is already up to date")
-                            return True
-                        raise
+                    logger.info(f"📝 Updating stack: {stack_name}")
+                    if not self._execute_change_set(stack_name, template_url, cf_parameters,
+                                                    capabilities or [], 'UPDATE', existing_stack):
+                        logger.info(f"ℹ️  Stack {stack_name} is already up to date")
+                        return existing_stack
+                    waiter_name = 'stack_update_complete'
             
             if not stack_exists:
-                print(f"🚀 Creating stack: {stack_name}")
+                logger.info(f"🚀 Creating stack: {stack_name}")
                 self.cf_client.create_stack(
                     StackName=stack_name,
                     TemplateURL=template_url,
                     Parameters=cf_parameters,
-                    Capabilities=capabilities or []
+                    Capabilities=capabilities or [],
+                    **self._notification_kwargs()
                 )
+                waiter_name = 'stack_create_complete'
             
             # Wait for stack operation to complete
-            return self._wait_for_stack_operation(stack_name)
+            success, stack = self._wait_for_stack_operation(stack_name, waiter_name)
+            return stack if success else None
             
         except Exception as e:
             error_msg = str(e)
             # Handle parameter mismatch errors
             if "do not exist in the template" in error_msg:
-                print(f"⚠️  Parameter mismatch detected - recreating stack: {stack_name}")
+                logger.warning(f"⚠️  Parameter mismatch detected - recreating stack: {stack_name}")
                 self._delete_stack(stack_name)
-                print(f"🚀 Creating stack: {stack_name}")
+                logger.info(f"🚀 Creating stack: {stack_name}")
                 self.cf_client.create_stack(
                     StackName=stack_name,
                     TemplateURL=template_url,
                     Parameters=cf_parameters,
-                    Capabilities=capabilities or []
+                    Capabilities=capabilities or [],
+                    **self._notification_kwargs()
                 )
-                return self._wait_for_stack_operation(stack_name)
+                success, stack = self._wait_for_stack_operation(stack_name, 'stack_create_complete')
+                return stack if success else None
             
-            print(f"❌ Failed to deploy {stack_name}: {error_msg}")
-            return False
+            logger.error(f"❌ Failed to deploy {stack_name}: {error_msg}")
+            return None
+    
+    def _execute_change_set(self, stack_name: str, template_url: str, cf_parameters: List[Dict[str, str]],
+                            capabilities: List[str], change_set_type: str, existing_stack: Dict) -> bool:
+        """Deploy a stack through a change set, returning False if there was nothing to change."""
+        change_set_name = f"deploy-{int(time.time())}"
+        self.cf_client.create_change_set(
+            StackName=stack_name,
+            ChangeSetName=change_set_name,
+            TemplateURL=template_url,
+            Parameters=cf_parameters,
+            Capabilities=capabilities,
+            ChangeSetType=change_set_type,
+            **self._notification_kwargs(existing_stack.get('NotificationARNs', []))
+        )
+        
+        try:
+            waiter = self.cf_client.get_waiter('change_set_create_complete')
+            waiter.wait(
+                StackName=stack_name,
+                ChangeSetName=change_set_name,
+                WaiterConfig=CHANGE_SET_WAITER_CONFIG
+            )
+        except WaiterError as e:
+            # Empty and failed change sets are left behind unless deleted
+            self.cf_client.delete_change_set(StackName=stack_name, ChangeSetName=change_set_name)
+            reason = (e.last_response or {}).get('StatusReason', '')
+            if "didn't contain changes" in reason or "No updates are to be performed" in reason:
+                return False
+            raise
+        
+        self.cf_client.execute_change_set(StackName=stack_name, ChangeSetName=change_set_name)
+        return True
     
     def _stack_exists(self, stack_name: str) -> bool:
         """Check if CloudFormation stack exists."""
         try:
-            response = self.cf_client.describe_stacks(StackName=stack_name)
-            stack_status = response['Stacks'][0]['StackStatus']
-            return stack_status not in ['DELETE_COMPLETE']
-        except:
-            return False
+            # describe_stack_resources is far less throttle-prone than describe_stacks
+            self.cf_client.describe_stack_resources(StackName=stack_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ValidationError' and 'does not exist' in str(e):
+                return False
+            raise
+        # Stacks with no resources yet (e.g. REVIEW_IN_PROGRESS) still exist
+        return True
     
-    def _needs_recreation(self, stack_name: str, new_parameters: Dict[str, str]) -> bool:
+    def _describe_stack(self, stack_name: str) -> Dict:
+        """Get the current description of a CloudFormation stack."""
+        response = self.cf_client.describe_stacks(StackName=stack_name)
+        return response['Stacks'][0]
+    
+    def _needs_recreation(self, stack: Dict, new_parameters: Dict[str, str]) -> bool:
         """Check if stack needs recreation due to parameter changes."""
-        try:
-            response = self.cf_client.describe_stacks(StackName=stack_name)
-            existing_params = {p['ParameterKey']: p['ParameterValue'] 
-                             for p in response['Stacks'][0].get('Parameters', [])}
-            
-            # Check if new parameters exist in the current stack
-            new_param_keys = set(new_parameters.keys())
-            existing_param_keys = set(existing_params.keys())
+        existing_params = {p['ParameterKey']: p['ParameterValue'] 
+                         for p in stack.get('Parameters', [])}
+        
+        # Check if new parameters exist in the current stack
+        new_param_keys = set(new_parameters.keys())
+        existing_param_keys = set(existing_params.keys())
+        
+        # If there are new parameters that don't exist in the stack, we need to recreate
+        if new_param_keys - existing_param_keys:
+            logger.info(f"ℹ️  New parameters detected: {new_param_keys - existing_param_keys}")
+            return True
             
-            # If there are new parameters that don't exist in the stack, we need to recreate
-            if new_param_keys - existing_param_keys:
-                print(f"ℹ️  New parameters detected: {new_param_keys - existing_param_keys}")
-                return True
-                
-            return False
-        except Exception as e:
-            print(f"⚠️  Could not check stack parameters: {str(e)}")
-            return False
+        return False
     
     def _delete_stack(self, stack_name: str) -> bool:
         """Delete a CloudFormation stack."""
         try:
-            print(f"🗑️  Deleting stack: {stack_name}")
+            logger.info(f"🗑️  Deleting stack: {stack_name}")
             self.cf_client.delete_stack(StackName=stack_name)
             
             # Wait for deletion to complete
-            print(f"⏳ Waiting for stack deletion to complete...")
+            logger.info(f"⏳ Waiting for stack deletion to complete...")
+            attempt = 0
+            last_status = None
             while True:
                 try:
                     response = self.cf_client.describe_stacks(StackName=stack_name)
                     status = response['Stacks'][0]['StackStatus']
+                    if status != last_status:
+                        # Poll quickly again after every status transition
+                        attempt = 0
+                        last_status = status
                     if status == 'DELETE_COMPLETE':
-                        print(f"✅ Stack {stack_name} deleted successfully")
+                        logger.info(f"✅ Stack {stack_name} deleted successfully")
                         return True
                     elif 'DELETE' in status:
-                        print(f"⏳ Deletion in progress: {status}")
-                        time.sleep(30)
+                        logger.info(f"⏳ Deletion in progress: {status}")
+                        time.sleep(self._backoff(attempt))
+                        attempt += 1
                     else:
-                        print(f"⚠️  Unexpected status during deletion: {status}")
-                        time.sleep(30)
+                        logger.warning(f"⚠️  Unexpected status during deletion: {status}")
+                        time.sleep(self._backoff(attempt))
+                        attempt += 1
                 except self.cf_client.exceptions.ClientError as e:
                     if 'does not exist' in str(e):
-                        print(f"✅ Stack {stack_name} deleted successfully")
+                        logger.info(f"✅ Stack {stack_name} deleted successfully")
                         return True
                     raise
         except Exception as e:
-            print(f"❌ Failed to delete stack {stack_name}: {str(e)}")
+            logger.error(f"❌ Failed to delete stack {stack_name}: {str(e)}")
             return False
     
-    def _wait_for_stack_operation(self, stack_name: str) -> bool:
-        """Wait for CloudFormation stack operation to complete."""
-        print(f"⏳ Waiting for stack operation to complete...")
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter, capped at 60 seconds."""
+        return random.uniform(0, min(60, 2 * 1.5 ** attempt))
+    
+    def _wait_for_stack_operation(self, stack_name: str, waiter_name: str) -> Tuple[bool, Optional[Dict]]:
+        """Wait for CloudFormation stack operation to complete, returning the terminal stack."""
+        logger.info(f"⏳ Waiting for stack operation to complete...")
         
-        while True:
+        try:
+            waiter = self.cf_client.get_waiter(waiter_name)
+            waiter.wait(StackName=stack_name, WaiterConfig=STACK_WAITER_CONFIG)
+            # Waiters don't hand back their last response, so describe the finished stack once
+            stack = self._describe_stack(stack_name)
+            logger.info(f"✅ Stack {stack_name} operation completed successfully")
+            return True, stack
+        except WaiterError as e:
+            stacks = (e.last_response or {}).get('Stacks', [])
+            stack_status = stacks[0]['StackStatus'] if stacks else e.reason
+            logger.error(f"❌ Stack {stack_name} operation failed: {stack_status}")
+            self._print_stack_events(stack_name)
+            return False, stacks[0] if stacks else None
+        except Exception as e:
+            logger.error(f"❌ Error checking stack status: {str(e)}")
+            return False, None
+    
+    def _notification_kwargs(self, existing_arns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Build the NotificationARNs argument, keeping topics the stack already publishes to."""
+        self._ensure_event_channel()
+        # Omit the argument entirely without a topic; an empty list would clear existing ones
+        if not self._event_topic_arn:
+            return {}
+        
+        notification_arns = list(existing_arns or [])
+        if self._event_topic_arn not in notification_arns:
+            notification_arns.append(self._event_topic_arn)
+        return {'NotificationARNs': notification_arns}
+    
+    def _ensure_event_channel(self):
+        """Create (or look up) the SNS topic and SQS queue used to tail stack events."""
+        with self._event_channel_lock:
+            if self._event_channel_ready or not self.environment:
+                return
+            self._event_channel_ready = True
+            
+            name = f"f1-platform-cfn-events-{self.environment}"
             try:
-                response = self.cf_client.describe_stacks(StackName=stack_name)
-                stack_status = response['Stacks'][0]['StackStatus']
+                # create_topic, create_queue and subscribe are all idempotent
+                topic_arn = self.sns_client.create_topic(Name=name)['TopicArn']
+                queue_url = self.sqs_client.create_queue(
+                    QueueName=name,
+                    Attributes={'MessageRetentionPeriod': str(EVENT_RETENTION_SECONDS)}
+                )['QueueUrl']
+                queue_arn = self.sqs_client.get_queue_attributes(
+                    QueueUrl=queue_url,
+                    AttributeNames=['QueueArn']
+                )['Attributes']['QueueArn']
                 
-                if stack_status in ['CREATE_COMPLETE', 'UPDATE_COMPLETE']:
-                    print(f"✅ Stack {stack_name} operation completed successfully")
-                    return True
-                elif stack_status in ['CREATE_FAILED', 'UPDATE_FAILED', 
-                                    'ROLLBACK_COMPLETE', 'UPDATE_ROLLBACK_COMPLETE']:
-                    print(f"❌ Stack {stack_name} operation failed: {stack_status}")
-                    self._print_stack_events(stack_name)
-                    return False
-                elif 'IN_PROGRESS' in stack_status:
-                    print(f"⏳ Stack status: {stack_status}")
-                    time.sleep(30)
-                else:
-                    print(f"⚠️  Unknown stack status: {stack_status}")
-                    time.sleep(30)
+                self.sqs_client.set_queue_attributes(
+                    QueueUrl=queue_url,
+                    Attributes={'Policy': json.dumps({
+                        'Version': '2012-10-17',
+                        'Statement': [{
+                            'Effect': 'Allow',
+                            'Principal': {'Service': 'sns.amazonaws.com'},
+                            'Action': 'sqs:SendMessage',
+                            'Resource': queue_arn,
+                            'Condition': {'ArnEquals': {'aws:SourceArn': topic_arn}}
+                        }]
+                    })}
+                )
+                self.sns_client.subscribe(
+                    TopicArn=topic_arn,
+                    Protocol='sqs',
+                    Endpoint=queue_arn,
+                    Attributes={'RawMessageDelivery': 'true'}
+                )
+            except ClientError as e:
+                logger.warning(f"⚠️  Could not set up stack event notifications: {str(e)}")
+                return
+            
+            self._event_topic_arn = topic_arn
+            self._event_queue_url = queue_url
+    
+    def _receive_stack_events(self, stack_name: str) -> List[Dict[str, str]]:
+        """Drain CloudFormation event notifications for a stack from the SQS queue."""
+        events = []
+        other_receipt_handles = []
+        wait_time = 20
+        try:
+            while True:
+                response = self.sqs_client.receive_message(
+                    QueueUrl=self._event_queue_url,
+                    WaitTimeSeconds=wait_time,
+                    MaxNumberOfMessages=10
+                )
+                messages = response.get('Messages', [])
+                if not messages:
+                    return events
+                
+                for message in messages:
+                    # Notifications are lines of Key='Value' pairs
+                    event = {}
+                    for line in message['Body'].splitlines():
+                        key, _, value = line.partition('=')
+                        event[key] = value.strip("'")
                     
-            except Exception as e:
-                print(f"❌ Error checking stack status: {str(e)}")
-                return False
+                    if event.get('StackName') == stack_name:
+                        events.append(event)
+                        self.sqs_client.delete_message(
+                            QueueUrl=self._event_queue_url,
+                            ReceiptHandle=message['ReceiptHandle']
+                        )
+                    else:
+                        other_receipt_handles.append(message['ReceiptHandle'])
+                
+                # Only long-poll for the first batch; stop as soon as the queue is drained
+                wait_time = 1
+        finally:
+            # Other stacks' events stay hidden while draining so the loop makes progress,
+            # then become visible again at once for stacks failing in parallel
+            for receipt_handle in other_receipt_handles:
+                self.sqs_client.change_message_visibility(
+                    QueueUrl=self._event_queue_url,
+                    ReceiptHandle=receipt_handle,
+                    VisibilityTimeout=0
+                )
     
     def _print_stack_events(self, stack_name: str):
         """Print recent stack events for debugging."""
         try:
-            events = self.cf_client.describe_stack_events(StackName=stack_name)
-            print("\n📋 Recent stack events:")
-            for event in events['StackEvents'][:5]:  # Show last 5 events
+            self._ensure_event_channel()
+            events = []
+            if self._event_queue_url:
+                events = self._receive_stack_events(stack_name)
+                events.sort(key=lambda event: event.get('Timestamp', ''), reverse=True)
+            if not events:
+                # No channel, or a parallel deployment was draining the queue at the same time
+                events = self.cf_client.describe_stack_events(StackName=stack_name)['StackEvents']
+            logger.info("📋 Recent stack events:")
+            for event in events[:5]:  # Show last 5 events
                 timestamp = event.get('Timestamp', 'Unknown')
                 resource_type = event.get('ResourceType', 'Unknown')
                 logical_id = event.get('LogicalResourceId', 'Unknown')
                 status = event.get('ResourceStatus', 'Unknown')
                 reason = event.get('ResourceStatusReason', '')
-                print(f"  {timestamp} - {resource_type} {logical_id}: {status} {reason}")
+                logger.info(f"  {timestamp} - {resource_type} {logical_id}: {status} {reason}")
         except Exception as e:
-            print(f"Could not retrieve stack events: {str(e)}")
+            logger.info(f"Could not retrieve stack events: {str(e)}")
+
+
+def group_stacks_by_level(stacks: List[Dict]) -> List[List[Dict]]:
+    """Group stacks into levels that only depend on stacks in earlier levels."""
+    stacks_by_name = {stack['name']: stack for stack in stacks}
+    depths = {}
     
-    def get_stack_outputs(self, stack_name: str) -> Dict[str, str]:
-        """Get CloudFormation stack outputs."""
-        try:
-            response = self.cf_client.describe_stacks(StackName=stack_name)
-            outputs = response['Stacks'][0].get('Outputs', [])
-            return {output['OutputKey']: output['OutputValue'] for output in outputs}
-        except Exception as e:
-            print(f"❌ Failed to get outputs from {stack_name}: {str(e)}")
-            return {}
+    def depth(stack: Dict) -> int:
+        if stack['name'] not in depths:
+            dependency = stacks_by_name.get(stack.get('depends_on'))
+            depths[stack['name']] = depth(dependency) + 1 if dependency else 0
+        return depths[stack['name']]
+    
+    levels = []
+    for stack in stacks:
+        level = depth(stack)
+        while len(levels) <= level:
+            levels.append([])
+        levels[level].append(stack)
+    return levels
+
+
+def deploy_stack_config(deployer: CloudFormationDeployer, stack_config: Dict, bucket_name: str,
+                        deployed_stacks: Dict[str, Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """Upload, resolve dependencies for and deploy a single stack, returning its outputs."""
+    # Upload template (use stack-specific template_dir)
+    template_path = stack_config['template_dir'] / stack_config['template']
+    if not template_path.exists():
+        logger.error(f"❌ Template not found: {template_path}")
+        return None
+    
+    # Catch template errors before spending time on a stack operation
+    if not deployer.validate_template(template_path):
+        return None
+        
+    upload = deployer.upload_template(template_path, bucket_name, "templates/")
+    if upload is None:
+        return None
+    template_url, needs_auto_expand = upload
+    
+    # Templates using macros (SAM, Include, ...) fail to deploy without this capability
+    capabilities = list(stack_config['capabilities'])
+    if needs_auto_expand and 'CAPABILITY_AUTO_EXPAND' not in capabilities:
+        capabilities.append('CAPABILITY_AUTO_EXPAND')
+    
+    # Handle dependencies
+    if 'depends_on' in stack_config:
+        dependency_stack = stack_config['depends_on']
+        if dependency_stack in deployed_stacks:
+            outputs = deployed_stacks[dependency_stack]
+            # Map foundation outputs to dependent stack parameters
+            for parameter, output in PARAMETER_TO_OUTPUT.items():
+                if parameter in stack_config['parameters']:
+                    stack_config['parameters'][parameter] = outputs.get(output, '')
+        else:
+            logger.error(f"❌ Dependency {dependency_stack} not found, skipping {stack_config['name']}")
+            return None
+    
+    # Deploy stack
+    stack = deployer.deploy_stack(
+        stack_config['name'],
+        template_url,
+        stack_config['parameters'],
+        capabilities
+    )
+    
+    if stack is None:
+        logger.error(f"❌ Failed to deploy {stack_config['name']}")
+        return None
+    
+    # Store outputs for dependent stacks
+    outputs = {output['OutputKey']: output['OutputValue'] for output in stack.get('Outputs', [])}
+    logger.info(f"📊 Stack outputs: {json.dumps(outputs, indent=2)}")
+    logger.info("-" * 70)
+    return outputs
 
 
 def main():
@@ -284,8 +668,11 @@ def main():
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    
     # Initialize deployer
-    deployer = CloudFormationDeployer(region=args.region, profile=args.profile)
+    deployer = CloudFormationDeployer(region=args.region, profile=args.profile,
+                                      environment=args.environment)
     
     # Create deployment bucket (without account ID in name)
     bucket_name = f"f1-platform-cf-templates-{args.environment}"
@@ -362,80 +749,50 @@ def main():
         }
     ]
     
-    print(f"🚀 Starting F1 Data Platform deployment to {args.environment} environment")
-    print(f"📍 Region: {args.region}")
-    print(f"🪣 Deployment bucket: {bucket_name}")
-    print("=" * 70)
+    logger.info(f"🚀 Starting F1 Data Platform deployment to {args.environment} environment")
+    logger.info(f"📍 Region: {args.region}")
+    logger.info(f"🪣 Deployment bucket: {bucket_name}")
+    logger.info("=" * 70)
     
-    # Deploy stacks in order
+    # Deploy stacks level by level; stacks within a level only depend on earlier levels
     deployed_stacks = {}
+    pending_stacks = []
     
     for stack_config in stacks:
         if stack_config['skip']:
-            print(f"⏭️  Skipping {stack_config['name']}")
+            logger.info(f"⏭️  Skipping {stack_config['name']}")
             continue
+        pending_stacks.append(stack_config)
+    
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_STACKS) as executor:
+        for level in group_stacks_by_level(pending_stacks):
+            results = list(executor.map(
+                lambda stack_config: deploy_stack_config(deployer, stack_config, bucket_name, deployed_stacks),
+                level
+            ))
             
-        # Upload template (use stack-specific template_dir)
-        template_path = stack_config['template_dir'] / stack_config['template']
-        if not template_path.exists():
-            print(f"❌ Template not found: {template_path}")
-            continue
+            for stack_config, outputs in zip(level, results):
+                if outputs is not None:
+                    deployed_stacks[stack_config['name']] = outputs
             
-        template_url = deployer.upload_template(template_path, bucket_name, "templates/")
-        
-        # Handle dependencies
-        if 'depends_on' in stack_config:
-            dependency_stack = stack_config['depends_on']
-            if dependency_stack in deployed_stacks:
-                outputs = deployed_stacks[dependency_stack]
-                # Map foundation outputs to dependent stack parameters
-                if 'DataLakeBucket' in stack_config['parameters']:
-                    stack_config['parameters']['DataLakeBucket'] = outputs.get('DataLakeBucketName', '')
-                if 'GlueDatabase' in stack_config['parameters']:
-                    stack_config['parameters']['GlueDatabase'] = outputs.get('GlueDatabaseName', '')
-                if 'GlueServiceRoleArn' in stack_config['parameters']:
-                    stack_config['parameters']['GlueServiceRoleArn'] = outputs.get('GlueServiceRoleArn', '')
-                if 'AthenaWorkgroup' in stack_config['parameters']:
-                    stack_config['parameters']['AthenaWorkgroup'] = outputs.get('AthenaWorkgroupName', '')
-                if 'AthenaResultsBucket' in stack_config['parameters']:
-                    stack_config['parameters']['AthenaResultsBucket'] = outputs.get('AthenaResultsBucketName', '')
-            else:
-                print(f"❌ Dependency {dependency_stack} not found, skipping {stack_config['name']}")
-                continue
-        
-        # Deploy stack
-        success = deployer.deploy_stack(
-            stack_config['name'],
-            template_url,
-            stack_config['parameters'],
-            stack_config['capabilities']
-        )
-        
-        if success:
-            # Store outputs for dependent stacks
-            outputs = deployer.get_stack_outputs(stack_config['name'])
-            deployed_stacks[stack_config['name']] = outputs
-            print(f"📊 Stack outputs: {json.dumps(outputs, indent=2)}")
-        else:
-            print(f"❌ Failed to deploy {stack_config['name']}")
-            break
-        
-        print("-" * 70)
+            # Don't start dependent stacks once anything in this level failed
+            if any(outputs is None for outputs in results):
+                break
     
     # Summary
-    print("\n🎯 Deployment Summary:")
+    logger.info("🎯 Deployment Summary:")
     for stack_name, outputs in deployed_stacks.items():
-        print(f"✅ {stack_name}: Successfully deployed")
+        logger.info(f"✅ {stack_name}: Successfully deployed")
     
     if len(deployed_stacks) == len([s for s in stacks if not s['skip']]):
-        print("\n🎉 F1 Data Platform deployment completed successfully!")
-        print("\nNext steps:")
-        print("1. Upload Glue ETL scripts to the data lake bucket")
-        print("2. Run the Glue crawlers to discover data schemas")
-        print("3. Execute the named queries in Athena for analytics")
-        print("4. Set up your F1 data extraction pipeline")
+        logger.info("🎉 F1 Data Platform deployment completed successfully!")
+        logger.info("Next steps:")
+        logger.info("1. Upload Glue ETL scripts to the data lake bucket")
+        logger.info("2. Run the Glue crawlers to discover data schemas")
+        logger.info("3. Execute the named queries in Athena for analytics")
+        logger.info("4. Set up your F1 data extraction pipeline")
     else:
-        print("\n⚠️  Deployment completed with errors. Check the logs above.")
+        logger.warning("⚠️  Deployment completed with errors. Check the logs above.")
 
 
 if __name__ == '__main__':
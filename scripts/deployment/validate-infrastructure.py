@@ -5,9 +5,22 @@ Validates deployed AWS CloudFormation infrastructure
 
 import boto3
 import argparse
+import logging
 import sys
 from typing import Dict, List, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(message)s'
+
+# Checks run concurrently, so retry throttled calls; each client makes at most
+# 9 calls at once, within the default pool of 10 connections
+BOTO_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
 
 class InfrastructureValidator:
     """Validates deployed AWS infrastructure"""
@@ -15,11 +28,13 @@ class InfrastructureValidator:
     def __init__(self, environment: str, region: str = 'us-east-1'):
         self.environment = environment
         self.region = region
-        self.cf_client = boto3.client('cloudformation', region_name=region)
-        self.s3_client = boto3.client('s3', region_name=region)
-        self.glue_client = boto3.client('glue', region_name=region)
-        self.athena_client = boto3.client('athena', region_name=region)
-        self.iam_client = boto3.client('iam', region_name=region)
+        # Share one session so credentials are resolved once for every client
+        self.session = boto3.Session(region_name=region)
+        self.cf_client = self.session.client('cloudformation', region_name=region, config=BOTO_CONFIG)
+        self.s3_client = self.session.client('s3', region_name=region, config=BOTO_CONFIG)
+        self.glue_client = self.session.client('glue', region_name=region, config=BOTO_CONFIG)
+        self.athena_client = self.session.client('athena', region_name=region, config=BOTO_CONFIG)
+        self.iam_client = self.session.client('iam', region_name=region, config=BOTO_CONFIG)
         
         self.validation_results = {
             'passed': [],
@@ -29,23 +44,28 @@ class InfrastructureValidator:
     
     def validate_all(self) -> bool:
         """Run all validation checks"""
-        print(f"\n🧪 Validating F1 Data Platform infrastructure in {self.environment}...")
-        print("=" * 70)
-        
-        # Validate stacks exist and are in good state
-        self.validate_cloudformation_stacks()
-        
-        # Validate S3 buckets
-        self.validate_s3_buckets()
+        logger.info(f"🧪 Validating F1 Data Platform infrastructure in {self.environment}...")
+        logger.info("=" * 70)
         
-        # Validate Glue resources
-        self.validate_glue_resources()
+        checks = [
+            ("📋 Validating CloudFormation Stacks...", self.validate_cloudformation_stacks),
+            ("🪣 Validating S3 Buckets...", self.validate_s3_buckets),
+            ("🔍 Validating Glue Resources...", self.validate_glue_resources),
+            ("📊 Validating Athena Resources...", self.validate_athena_resources),
+            ("🔐 Validating IAM Resources...", self.validate_iam_resources)
+        ]
         
-        # Validate Athena resources
-        self.validate_athena_resources()
+        # Checks hit independent services, so run them concurrently and
+        # report their results afterwards in a fixed order
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            check_results = list(executor.map(lambda check: check(), [check for _, check in checks]))
         
-        # Validate IAM roles and policies
-        self.validate_iam_resources()
+        log_levels = {'passed': logging.INFO, 'warnings': logging.WARNING, 'failed': logging.ERROR}
+        for (title, _), results in zip(checks, check_results):
+            logger.info(title)
+            for category, message in results:
+                self.validation_results[category].append(message)
+                logger.log(log_levels[category], f"  {message}")
         
         # Print summary
         self.print_summary()
@@ -53,9 +73,9 @@ class InfrastructureValidator:
         # Return overall status
         return len(self.validation_results['failed']) == 0
     
-    def validate_cloudformation_stacks(self):
+    def validate_cloudformation_stacks(self) -> List[Tuple[str, str]]:
         """Validate CloudFormation stacks are deployed and healthy"""
-        print("\n📋 Validating CloudFormation Stacks...")
+        results = []
         
         expected_stacks = [
             f'f1-data-platform-foundation-{self.environment}',
@@ -64,38 +84,36 @@ class InfrastructureValidator:
             f'f1-data-platform-access-{self.environment}'
         ]
         
+        # One paginated describe_stacks covers every stack instead of a call per stack
+        try:
+            paginator = self.cf_client.get_paginator('describe_stacks')
+            all_stacks = {
+                stack['StackName']: stack
+                for page in paginator.paginate()
+                for stack in page['Stacks']
+            }
+        except self.cf_client.exceptions.ClientError as e:
+            for stack_name in expected_stacks:
+                results.append(('failed', f"❌ Stack {stack_name}: ERROR - {str(e)}"))
+            return results
+        
         for stack_name in expected_stacks:
-            try:
-                response = self.cf_client.describe_stacks(StackName=stack_name)
-                stack = response['Stacks'][0]
-                status = stack['StackStatus']
-                
-                if 'COMPLETE' in status and 'ROLLBACK' not in status:
-                    self.validation_results['passed'].append(
-                        f"✅ Stack {stack_name}: {status}"
-                    )
-                    print(f"  ✅ {stack_name}: {status}")
-                else:
-                    self.validation_results['failed'].append(
-                        f"❌ Stack {stack_name}: {status}"
-                    )
-                    print(f"  ❌ {stack_name}: {status}")
-                    
-            except self.cf_client.exceptions.ClientError as e:
-                if 'does not exist' in str(e):
-                    self.validation_results['failed'].append(
-                        f"❌ Stack {stack_name}: NOT FOUND"
-                    )
-                    print(f"  ❌ {stack_name}: NOT FOUND")
-                else:
-                    self.validation_results['failed'].append(
-                        f"❌ Stack {stack_name}: ERROR - {str(e)}"
-                    )
-                    print(f"  ❌ {stack_name}: ERROR - {str(e)}")
+            stack = all_stacks.get(stack_name)
+            if stack is None:
+                results.append(('failed', f"❌ Stack {stack_name}: NOT FOUND"))
+                continue
+            
+            status = stack['StackStatus']
+            if 'COMPLETE' in status and 'ROLLBACK' not in status:
+                results.append(('passed', f"✅ Stack {stack_name}: {status}"))
+            else:
+                results.append(('failed', f"❌ Stack {stack_name}: {status}"))
+        
+        return results
     
-    def validate_s3_buckets(self):
+    def validate_s3_buckets(self) -> List[Tuple[str, str]]:
         """Validate S3 buckets exist and have correct configuration"""
-        print("\n🪣 Validating S3 Buckets...")
+        results = []
         
         expected_buckets = [
             f'f1-data-lake-{self.environment}',
@@ -103,81 +121,75 @@ class InfrastructureValidator:
             f'f1-platform-cf-templates-{self.environment}'
         ]
         
-        for bucket_name in expected_buckets:
+        # Fan out head/versioning/encryption calls for every bucket at once
+        with ThreadPoolExecutor(max_workers=len(expected_buckets) * 3) as executor:
+            bucket_checks = {
+                bucket_name: (
+                    executor.submit(self.s3_client.head_bucket, Bucket=bucket_name),
+                    executor.submit(self.s3_client.get_bucket_versioning, Bucket=bucket_name),
+                    executor.submit(self._bucket_encryption_enabled, bucket_name)
+                )
+                for bucket_name in expected_buckets
+            }
+        
+        for bucket_name, (exists, versioning, encryption) in bucket_checks.items():
             try:
                 # Check bucket exists
-                self.s3_client.head_bucket(Bucket=bucket_name)
+                exists.result()
                 
                 # Check versioning
-                versioning = self.s3_client.get_bucket_versioning(Bucket=bucket_name)
-                versioning_status = versioning.get('Status', 'Disabled')
+                versioning_status = versioning.result().get('Status', 'Disabled')
                 
                 # Check encryption
-                try:
-                    encryption = self.s3_client.get_bucket_encryption(Bucket=bucket_name)
-                    encryption_enabled = True
-                except self.s3_client.exceptions.ClientError:
-                    encryption_enabled = False
+                encryption_enabled = encryption.result()
                 
                 if versioning_status == 'Enabled' and encryption_enabled:
-                    self.validation_results['passed'].append(
-                        f"✅ Bucket {bucket_name}: Versioning={versioning_status}, Encryption=Enabled"
-                    )
-                    print(f"  ✅ {bucket_name}: Versioning={versioning_status}, Encryption=Enabled")
+                    results.append(('passed', f"✅ Bucket {bucket_name}: Versioning={versioning_status}, Encryption=Enabled"))
                 else:
-                    self.validation_results['warnings'].append(
-                        f"⚠️ Bucket {bucket_name}: Versioning={versioning_status}, Encryption={'Enabled' if encryption_enabled else 'Disabled'}"
-                    )
-                    print(f"  ⚠️ {bucket_name}: Versioning={versioning_status}, Encryption={'Enabled' if encryption_enabled else 'Disabled'}")
+                    results.append(('warnings', f"⚠️ Bucket {bucket_name}: Versioning={versioning_status}, Encryption={'Enabled' if encryption_enabled else 'Disabled'}"))
                     
             except self.s3_client.exceptions.ClientError as e:
                 if e.response['Error']['Code'] == '404':
-                    self.validation_results['failed'].append(
-                        f"❌ Bucket {bucket_name}: NOT FOUND"
-                    )
-                    print(f"  ❌ {bucket_name}: NOT FOUND")
+                    results.append(('failed', f"❌ Bucket {bucket_name}: NOT FOUND"))
                 else:
-                    self.validation_results['failed'].append(
-                        f"❌ Bucket {bucket_name}: ERROR - {str(e)}"
-                    )
-                    print(f"  ❌ {bucket_name}: ERROR - {str(e)}")
+                    results.append(('failed', f"❌ Bucket {bucket_name}: ERROR - {str(e)}"))
+        
+        return results
+    
+    def _bucket_encryption_enabled(self, bucket_name: str) -> bool:
+        """Check whether default encryption is configured on a bucket"""
+        try:
+            self.s3_client.get_bucket_encryption(Bucket=bucket_name)
+            return True
+        except self.s3_client.exceptions.ClientError:
+            return False
     
-    def validate_glue_resources(self):
+    def validate_glue_resources(self) -> List[Tuple[str, str]]:
         """Validate Glue databases and crawlers"""
-        print("\n🔍 Validating Glue Resources...")
+        results = []
         
         # Check Glue database - use correct naming from CloudFormation template
         database_name = f'f1-data-platform_{self.environment}'
         try:
             self.glue_client.get_database(Name=database_name)
-            self.validation_results['passed'].append(
-                f"✅ Glue Database {database_name}: EXISTS"
-            )
-            print(f"  ✅ Glue Database {database_name}: EXISTS")
+            results.append(('passed', f"✅ Glue Database {database_name}: EXISTS"))
         except self.glue_client.exceptions.EntityNotFoundException:
-            self.validation_results['failed'].append(
-                f"❌ Glue Database {database_name}: NOT FOUND"
-            )
-            print(f"  ❌ Glue Database {database_name}: NOT FOUND")
+            results.append(('failed', f"❌ Glue Database {database_name}: NOT FOUND"))
         
         # Check Glue crawler
         crawler_name = f'f1-data-crawler-{self.environment}'
         try:
             response = self.glue_client.get_crawler(Name=crawler_name)
             crawler_state = response['Crawler']['State']
-            self.validation_results['passed'].append(
-                f"✅ Glue Crawler {crawler_name}: {crawler_state}"
-            )
-            print(f"  ✅ Glue Crawler {crawler_name}: {crawler_state}")
+            results.append(('passed', f"✅ Glue Crawler {crawler_name}: {crawler_state}"))
         except self.glue_client.exceptions.EntityNotFoundException:
-            self.validation_results['warnings'].append(
-                f"⚠️ Glue Crawler {crawler_name}: NOT FOUND (optional)"
-            )
-            print(f"  ⚠️ Glue Crawler {crawler_name}: NOT FOUND (optional)")
+            results.append(('warnings', f"⚠️ Glue Crawler {crawler_name}: NOT FOUND (optional)"))
+        
+        return results
     
-    def validate_athena_resources(self):
+    def validate_athena_resources(self) -> List[Tuple[str, str]]:
         """Validate Athena workgroups"""
-        print("\n📊 Validating Athena Resources...")
+        results = []
         
         # Use correct workgroup name from CloudFormation template
         workgroup_name = f'f1-data-platform-{self.environment}'
@@ -186,25 +198,18 @@ class InfrastructureValidator:
             state = response['WorkGroup']['State']
             
             if state == 'ENABLED':
-                self.validation_results['passed'].append(
-                    f"✅ Athena Workgroup {workgroup_name}: {state}"
-                )
-                print(f"  ✅ Athena Workgroup {workgroup_name}: {state}")
+                results.append(('passed', f"✅ Athena Workgroup {workgroup_name}: {state}"))
             else:
-                self.validation_results['warnings'].append(
-                    f"⚠️ Athena Workgroup {workgroup_name}: {state}"
-                )
-                print(f"  ⚠️ Athena Workgroup {workgroup_name}: {state}")
+                results.append(('warnings', f"⚠️ Athena Workgroup {workgroup_name}: {state}"))
                 
         except self.athena_client.exceptions.InvalidRequestException:
-            self.validation_results['failed'].append(
-                f"❌ Athena Workgroup {workgroup_name}: NOT FOUND"
-            )
-            print(f"  ❌ Athena Workgroup {workgroup_name}: NOT FOUND")
+            results.append(('failed', f"❌ Athena Workgroup {workgroup_name}: NOT FOUND"))
+        
+        return results
     
-    def validate_iam_resources(self):
+    def validate_iam_resources(self) -> List[Tuple[str, str]]:
         """Validate IAM roles exist"""
-        print("\n🔐 Validating IAM Resources...")
+        results = []
         
         # Use correct role names from CloudFormation template
         # Pattern: ${ProjectName}-{service}-role-${Environment}
@@ -214,51 +219,59 @@ class InfrastructureValidator:
             f'f1-data-platform-athena-role-{self.environment}'
         ]
         
+        # list_roles returns 100 roles per page by default; ask for the 1000 maximum
+        try:
+            paginator = self.iam_client.get_paginator('list_roles')
+            existing_roles = {
+                role['RoleName']
+                for page in paginator.paginate(PaginationConfig={'PageSize': 1000})
+                for role in page['Roles']
+            }
+        except self.iam_client.exceptions.ClientError as e:
+            for role_name in expected_roles:
+                results.append(('failed', f"❌ IAM Role {role_name}: ERROR - {str(e)}"))
+            return results
+
         for role_name in expected_roles:
-            try:
-                self.iam_client.get_role(RoleName=role_name)
-                self.validation_results['passed'].append(
-                    f"✅ IAM Role {role_name}: EXISTS"
-                )
-                print(f"  ✅ IAM Role {role_name}: EXISTS")
-            except self.iam_client.exceptions.NoSuchEntityException:
-                self.validation_results['warnings'].append(
-                    f"⚠️ IAM Role {role_name}: NOT FOUND (may use default naming)"
-                )
-                print(f"  ⚠️ IAM Role {role_name}: NOT FOUND (may use default naming)")
+            if role_name in existing_roles:
+                results.append(('passed', f"✅ IAM Role {role_name}: EXISTS"))
+            else:
+                results.append(('warnings', f"⚠️ IAM Role {role_name}: NOT FOUND (may use default naming)"))
+        
+        return results
     
     def print_summary(self):
         """Print validation summary"""
-        print("\n" + "=" * 70)
-        print("📊 Validation Summary")
-        print("=" * 70)
+        logger.info("=" * 70)
+        logger.info("📊 Validation Summary")
+        logger.info("=" * 70)
         
         total = (len(self.validation_results['passed']) + 
                 len(self.validation_results['failed']) + 
                 len(self.validation_results['warnings']))
         
-        print(f"\nTotal Checks: {total}")
-        print(f"✅ Passed: {len(self.validation_results['passed'])}")
-        print(f"❌ Failed: {len(self.validation_results['failed'])}")
-        print(f"⚠️ Warnings: {len(self.validation_results['warnings'])}")
+        logger.info(f"Total Checks: {total}")
+        logger.info(f"✅ Passed: {len(self.validation_results['passed'])}")
+        logger.info(f"❌ Failed: {len(self.validation_results['failed'])}")
+        logger.info(f"⚠️ Warnings: {len(self.validation_results['warnings'])}")
         
         if self.validation_results['failed']:
-            print("\n❌ Failed Checks:")
+            logger.error("❌ Failed Checks:")
             for check in self.validation_results['failed']:
-                print(f"  {check}")
+                logger.error(f"  {check}")
         
         if self.validation_results['warnings']:
-            print("\n⚠️ Warnings:")
+            logger.warning("⚠️ Warnings:")
             for check in self.validation_results['warnings']:
-                print(f"  {check}")
+                logger.warning(f"  {check}")
         
-        print("\n" + "=" * 70)
+        logger.info("=" * 70)
         
         if len(self.validation_results['failed']) == 0:
-            print("✅ All critical validation checks passed!")
+            logger.info("✅ All critical validation checks passed!")
             return 0
         else:
-            print("❌ Some validation checks failed!")
+            logger.error("❌ Some validation checks failed!")
             return 1
 
 
@@ -280,6 +293,8 @@ def main():
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    
     # Create validator and run checks
     validator = InfrastructureValidator(args.environment, args.region)
     success = validator.validate_all()